@@ -4,85 +4,121 @@ OpenAI Agents SDK - LinkedIn Auto-Poster
 This creates an agent that can be triggered via API or scheduled.
 """
 
+import json
 import os
 import sys
-from openai import OpenAI
-from dotenv import load_dotenv
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from src.tools.rss_fetcher import fetch_rss_feeds
-from src.tools.gnews_fetcher import fetch_gnews
-from src.tools.linkedin_poster import post_to_linkedin
-from src.tools.article_fetcher import fetch_article_content
-from src.agents.prompts import CONTENT_WRITER_PROMPT, NEWS_CURATOR_PROMPT
-
-load_dotenv()
-
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+from src.agents.prompts import (
+    CONTENT_WRITER_PROMPT,
+    NEWS_CURATOR_PROMPT,
+    get_curate_and_write_prompt,
+)
+from agent_builder.pipeline import (
+    client,
+    curated_urls,
+    fetch_all_articles,
+    fetch_articles_parallel,
+    make_semantic_caches,
+    post_to_linkedin,
+    prefetch_articles,
+    summary_budget,
+    truncate_tokens,
+)
+
+# Own cache files, so this CLI and the tools server don't overwrite each other
+_curator_cache, _writer_cache = make_semantic_caches("agent")
 
 
 def fetch_and_format_news(hours_back=48):
     """Fetch news from all sources and format for agent."""
-    rss_articles = fetch_rss_feeds(hours_back=hours_back)
-    gnews_articles = fetch_gnews()
-    all_articles = rss_articles + gnews_articles
+    all_articles = fetch_all_articles(hours_back)
 
     if not all_articles:
         return None, []
 
-    text = f"Found {len(all_articles)} articles:\n\n"
+    summary_tokens = summary_budget(len(all_articles))
+    parts = [f"Found {len(all_articles)} articles:\n\n"]
     for i, article in enumerate(all_articles, 1):
-        text += f"--- Article {i} ---\n"
-        text += f"Source: {article['source']}\n"
-        text += f"Title: {article['title']}\n"
-        text += f"URL: {article['url']}\n"
-        text += f"Summary: {article['summary'][:800]}\n\n"
+        parts.append(
+            f"--- Article {i} ---\n"
+            f"Source: {article['source']}\n"
+            f"Title: {article['title']}\n"
+            f"URL: {article['url']}\n"
+            f"Summary: {truncate_tokens(article['summary'], summary_tokens)}\n\n"
+        )
 
-    return text, all_articles
+    return "".join(parts), all_articles
 
 
 def curate_articles(articles_text):
     """Use AI to select best articles."""
-    response = client.chat.completions.create(
-        model="gpt-4o",
-        messages=[
-            {"role": "system", "content": "Select the most interesting AI news for developers."},
-            {"role": "user", "content": NEWS_CURATOR_PROMPT.format(articles=articles_text)}
-        ],
-        temperature=0.7,
-    )
-    return response.choices[0].message.content
-
-
-def fetch_full_content(curated_text):
+    def create():
+        response = client.chat.completions.create(
+            model="gpt-4o",
+            messages=[
+                {"role": "system", "content": "Select the most interesting AI news for developers."},
+                {"role": "user", "content": NEWS_CURATOR_PROMPT.format(articles=articles_text)}
+            ],
+            temperature=0.7,
+            response_format={"type": "json_object"},
+        )
+        return response.choices[0].message.content
+
+    return _curator_cache.get_or_create(articles_text, create)
+
+
+def fetch_full_content(curated_text, prefetched=None):
     """Fetch full article content from URLs."""
-    import re
-    urls = re.findall(r'https?://[^\s<>"{}|\\^`\[\]]+', curated_text)[:4]
+    urls = curated_urls(curated_text, 4)
+
+    parts = [curated_text, "\n\nFULL ARTICLE CONTENT:\n"]
 
-    full_content = curated_text + "\n\nFULL ARTICLE CONTENT:\n"
-    for url in urls:
-        clean_url = url.rstrip(')')
-        article = fetch_article_content(clean_url, 2000)
-        full_content += f"\n=== {article['title']} ===\n{article['content'][:2000]}\n"
+    # Reuse prefetched futures and fetch the rest in parallel, keeping curator order
+    for article in fetch_articles_parallel(urls, 2000, prefetched):
+        parts.append(f"\n=== {article['title']} ===\n{article['content'][:2000]}\n")
 
-    return full_content
+    return "".join(parts)
 
 
 def generate_human_post(content):
     """Generate human-like LinkedIn post."""
+    def create():
+        response = client.chat.completions.create(
+            model="gpt-4o",
+            messages=[
+                {"role": "system", "content": "Write like a real human, not an AI. Be casual, use natural language."},
+                {"role": "user", "content": CONTENT_WRITER_PROMPT.format(curated_articles=content)}
+            ],
+            temperature=0.8,
+        )
+        return response.choices[0].message.content
+
+    return _writer_cache.get_or_create(content, create)
+
+
+def curate_and_write(articles_text):
+    """Pick the best articles and write the post in a single gpt-4o call.
+
+    Returns (chosen_urls, post). Saves one model round-trip compared to
+    curate_articles + generate_human_post, at the cost of writing from the
+    article summaries rather than the full content.
+    """
     response = client.chat.completions.create(
         model="gpt-4o",
         messages=[
             {"role": "system", "content": "Write like a real human, not an AI. Be casual, use natural language."},
-            {"role": "user", "content": CONTENT_WRITER_PROMPT.format(curated_articles=content)}
+            {"role": "user", "content": get_curate_and_write_prompt(articles_text)}
         ],
         temperature=0.8,
+        response_format={"type": "json_object"},
     )
-    return response.choices[0].message.content
+    result = json.loads(response.choices[0].message.content)
+    return result.get("chosen_urls", []), result.get("post", "")
 
 
-def run_workflow(hours_back=48, post_to_linkedin_flag=False):
+def run_workflow(hours_back=48, post_to_linkedin_flag=False, single_pass=False):
     """Run the complete workflow."""
     print("=" * 50)
     print("LINKEDIN AI AUTO-POSTER")
@@ -96,20 +132,27 @@ def run_workflow(hours_back=48, post_to_linkedin_flag=False):
         return None
     print(f"   Found {len(all_articles)} articles")
 
-    # Step 2: Curate
-    print("\n2. Curating best articles...")
-    curated = curate_articles(articles_text)
-    print("   Done")
-
-    # Step 3: Fetch full content
-    print("\n3. Fetching full article content...")
-    full_content = fetch_full_content(curated)
-    print("   Done")
-
-    # Step 4: Generate post
-    print("\n4. Generating human-like post...")
-    post = generate_human_post(full_content)
-    print("   Done")
+    if single_pass:
+        # Steps 2-4 in one call: curate and write from the summaries
+        print("\n2. Curating and writing post in one pass...")
+        chosen_urls, post = curate_and_write(articles_text)
+        print(f"   Done ({len(chosen_urls)} articles picked)")
+    else:
+        # Step 2: Curate (warm the top candidates' full content in the meantime)
+        print("\n2. Curating best articles...")
+        prefetched = prefetch_articles(all_articles, 2000)
+        curated = curate_articles(articles_text)
+        print("   Done")
+
+        # Step 3: Fetch full content
+        print("\n3. Fetching full article content...")
+        full_content = fetch_full_content(curated, prefetched)
+        print("   Done")
+
+        # Step 4: Generate post
+        print("\n4. Generating human-like post...")
+        post = generate_human_post(full_content)
+        print("   Done")
 
     print("\n" + "=" * 50)
     print("GENERATED POST:")
@@ -197,10 +240,11 @@ if __name__ == "__main__":
     parser.add_argument("--post", action="store_true", help="Post to LinkedIn")
     parser.add_argument("--hours", type=int, default=48, help="Hours back")
     parser.add_argument("--create-assistant", action="store_true", help="Create OpenAI Assistant")
+    parser.add_argument("--single-pass", action="store_true", help="Curate and write in one model call")
 
     args = parser.parse_args()
 
     if args.create_assistant:
         create_assistant()
     else:
-        run_workflow(hours_back=args.hours, post_to_linkedin_flag=args.post)
+        run_workflow(hours_back=args.hours, post_to_linkedin_flag=args.post, single_pass=args.single_pass)
@@ -0,0 +1,187 @@
+"""
+Shared Pipeline for the Agent Entry Points
+Fetching, token budgeting, prefetching and the model caches used by both
+openai_agent.py and tools_server.py.
+"""
+
+import atexit
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import orjson
+from openai import OpenAI
+from dotenv import load_dotenv
+
+from src.tools.dedupe import dedupe_articles
+from src.agents.prompts import CURATOR_STATIC_PREFIX, WRITER_STATIC_PREFIX, prefix_key
+from agent_builder.semantic_cache import SemanticCache
+
+
+# The fetchers pull in feedparser, BeautifulSoup etc.; import them on first use
+# so startup doesn't pay for code paths a run never hits.
+@lru_cache(maxsize=1)
+def _rss():
+    from src.tools.rss_fetcher import fetch_rss_feeds
+    return fetch_rss_feeds
+
+
+@lru_cache(maxsize=1)
+def _gnews():
+    from src.tools.gnews_fetcher import fetch_gnews
+    return fetch_gnews
+
+
+@lru_cache(maxsize=1)
+def _article_content():
+    from src.tools.article_fetcher import fetch_article_content
+    return fetch_article_content
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    # Loading the gpt-4o encoding can download its BPE file on a fresh host,
+    # so it happens on the first truncation rather than at startup
+    import tiktoken
+    return tiktoken.encoding_for_model("gpt-4o")
+
+
+@lru_cache(maxsize=1)
+def _linkedin():
+    from src.tools import linkedin_poster
+    return linkedin_poster
+
+
+def post_to_linkedin(content: str) -> dict:
+    """post_to_linkedin() from the LinkedIn poster, imported on first use."""
+    return _linkedin().post_to_linkedin(content)
+
+
+def validate_linkedin_token() -> dict:
+    """validate_linkedin_token() from the LinkedIn poster, imported on first use."""
+    return _linkedin().validate_linkedin_token()
+
+
+load_dotenv()
+
+client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+# One process-wide pool for all background I/O (RSS/GNews fan-out, article
+# prefetch and full-content fetches) so no call pays for creating threads
+POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="linkedin-io")
+atexit.register(POOL.shutdown)
+
+# URLs in curator output (compiled once instead of per call)
+_URL_RE = re.compile(r'https?://[^\s<>"{}|\\^`\[\]]+')
+
+# Number of candidate articles to prefetch while the curator is running
+PREFETCH_COUNT = 8
+
+# Summaries are cut by model tokens, not characters, so the curator prompt size
+# is predictable: the article list targets ~CURATOR_PROMPT_TOKENS in total.
+CURATOR_PROMPT_TOKENS = 6000
+MIN_SUMMARY_TOKENS = 60
+MAX_SUMMARY_TOKENS = 200
+
+# Merged RSS + GNews results are reused briefly so back-to-back calls
+# ("fetch, then generate") don't hit every feed twice
+ARTICLES_TTL = 60
+ARTICLES_CACHE_MAX_ENTRIES = 4
+_articles_cache = {}  # hours_back -> (fetched_at, articles)
+_articles_cache_lock = threading.Lock()
+
+
+def make_semantic_caches(scope: str) -> tuple:
+    """
+    Build the (curator, writer) caches for one entry point.
+
+    Near-duplicate article sets within a few minutes reuse the previous
+    curation. The writer only reuses a post for exactly the same content, since
+    a post written for similar articles may be published as-is. Files are named
+    by scope, so entry points don't overwrite each other, and by the prompt's
+    static prefix, so editing a prompt starts fresh instead of replaying
+    completions written for the old instructions.
+    """
+    curator = SemanticCache(client, f"{scope}_curator_{prefix_key(CURATOR_STATIC_PREFIX)}", threshold=0.95)
+    writer = SemanticCache(client, f"{scope}_writer_{prefix_key(WRITER_STATIC_PREFIX)}", exact=True)
+    return curator, writer
+
+
+def fetch_all_articles(hours_back: int = 48) -> list:
+    """
+    Fetch RSS feeds and GNews concurrently and merge them, dropping duplicate URLs.
+
+    Results are memoized per hours_back for ARTICLES_TTL seconds.
+    """
+    with _articles_cache_lock:
+        entry = _articles_cache.get(hours_back)
+    if entry and time.monotonic() - entry[0] < ARTICLES_TTL:
+        return list(entry[1])
+
+    rss_future = POOL.submit(_rss(), hours_back=hours_back)
+    gnews_future = POOL.submit(_gnews())
+    articles = dedupe_articles(rss_future.result() + gnews_future.result())
+
+    with _articles_cache_lock:
+        _articles_cache.pop(hours_back, None)
+        _articles_cache[hours_back] = (time.monotonic(), articles)
+        while len(_articles_cache) > ARTICLES_CACHE_MAX_ENTRIES:
+            del _articles_cache[next(iter(_articles_cache))]
+
+    return list(articles)
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to at most max_tokens gpt-4o tokens."""
+    enc = _encoding()
+    tokens = enc.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return enc.decode(tokens[:max_tokens])
+
+
+def summary_budget(article_count: int) -> int:
+    """Split the curator prompt budget evenly across articles, within sane bounds."""
+    per_article = CURATOR_PROMPT_TOKENS // max(article_count, 1)
+    return max(MIN_SUMMARY_TOKENS, min(MAX_SUMMARY_TOKENS, per_article))
+
+
+def curated_urls(curated: str, limit: int) -> list:
+    """URLs the curator chose, from its JSON output.
+
+    Falls back to scraping URLs from the text for free-form responses
+    (e.g. entries persisted in the semantic cache before the JSON format).
+    """
+    try:
+        urls = orjson.loads(curated)["urls"]
+    except (orjson.JSONDecodeError, KeyError, TypeError):
+        urls = [url.rstrip(')') for url in _URL_RE.findall(curated)]
+    return [url for url in urls if isinstance(url, str)][:limit]
+
+
+def prefetch_articles(articles: list, max_length: int, limit: int = PREFETCH_COUNT) -> dict:
+    """Start fetching the top candidates' content while curation runs (URL -> Future).
+
+    fetch_articles_parallel consumes the returned futures, so articles the
+    curator picks are usually ready by the time they're needed.
+    """
+    prefetched = {}
+    for article in articles[:limit]:
+        url = article.get('url')
+        if url and url not in prefetched:
+            prefetched[url] = POOL.submit(_article_content(), url, max_length)
+    return prefetched
+
+
+def fetch_articles_parallel(urls: list, max_length: int, prefetched: dict = None) -> list:
+    """Fetch full content for each URL in parallel, preserving input order."""
+    prefetched = prefetched or {}
+
+    futures = []
+    for url in urls:
+        clean_url = url.rstrip(')')
+        futures.append(prefetched.get(clean_url) or POOL.submit(_article_content(), clean_url, max_length))
+
+    return [future.result() for future in futures]
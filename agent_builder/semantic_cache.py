@@ -0,0 +1,171 @@
+"""
+Semantic Cache for LLM Calls
+Reuses a recent completion when a new prompt is semantically close to one already answered.
+"""
+
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional
+
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+# text-embedding-3-small accepts ~8k tokens. Longer keys aren't embedded (a
+# truncated embedding can't tell two inputs with the same opening apart), so
+# they only hit on an exact match of the full text.
+MAX_EMBED_CHARS = 24000
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache")
+
+
+def _normalize(vector: List[float]) -> List[float]:
+    """L2-normalize so a dot product is the cosine similarity."""
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return [x / norm for x in vector]
+
+
+class SemanticCache:
+    """
+    In-memory semantic cache with TTL and LRU eviction, persisted to disk.
+
+    Entries are keyed by a hash of the prompt's dynamic content and its
+    normalized embedding. A lookup hits on the same hash, or when the best
+    cosine similarity >= threshold. With exact=True only the hash is compared
+    and nothing is embedded. The cache is small, so a linear scan is cheaper
+    than maintaining an index.
+
+    Each new entry is appended to a JSON-lines file outside the lookup lock;
+    the file is compacted to the live entries once, when it is loaded.
+    """
+
+    def __init__(
+        self,
+        client,
+        name: str,
+        threshold: float = 1.0,
+        ttl: int = 300,
+        max_entries: int = 128,
+        exact: bool = False,
+    ):
+        self.client = client
+        self.threshold = threshold
+        self.exact = exact
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.path = os.path.join(CACHE_DIR, f"semantic_{name}.jsonl")
+        self._entries = OrderedDict()  # id -> (created_at, key_hash, embedding, response)
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._file_lock = threading.Lock()
+        self._load()
+
+    def get_or_create(self, key_text: str, create: Callable[[], str]) -> str:
+        """Return a cached response for a similar key, or call create() and cache its result."""
+        key_hash = hashlib.sha256(key_text.encode()).hexdigest()
+        embedding = None
+        if not self.exact and len(key_text) <= MAX_EMBED_CHARS:
+            try:
+                embedding = self._embed(key_text)
+            except Exception as e:
+                print(f"Semantic cache unavailable, calling model directly: {e}")
+                return create()
+
+        cached = self._lookup(key_hash, embedding)
+        if cached is not None:
+            return cached
+
+        response = create()
+        self._store(key_hash, embedding, response)
+        return response
+
+    def _embed(self, text: str) -> List[float]:
+        response = self.client.embeddings.create(
+            model=EMBEDDING_MODEL,
+            input=text,
+        )
+        return _normalize(response.data[0].embedding)
+
+    def _evict_expired(self, now: float):
+        expired = [key for key, (created_at, _, _, _) in self._entries.items() if now - created_at > self.ttl]
+        for key in expired:
+            del self._entries[key]
+
+    def _lookup(self, key_hash: str, embedding: Optional[List[float]]) -> Optional[str]:
+        with self._lock:
+            self._evict_expired(time.time())
+
+            best_key, best_sim = None, -1.0
+            for key, (_, cached_hash, cached_embedding, _) in self._entries.items():
+                if cached_hash == key_hash:
+                    best_key, best_sim = key, 1.0
+                    break
+                if embedding is None or cached_embedding is None:
+                    continue
+                sim = sum(a * b for a, b in zip(embedding, cached_embedding))
+                if sim > best_sim:
+                    best_key, best_sim = key, sim
+
+            if best_key is None or best_sim < self.threshold:
+                return None
+
+            self._entries.move_to_end(best_key)
+            return self._entries[best_key][3]
+
+    def _store(self, key_hash: str, embedding: Optional[List[float]], response: str):
+        entry = (time.time(), key_hash, embedding, response)
+        with self._lock:
+            self._entries[self._next_id] = entry
+            self._next_id += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        self._append(entry)
+
+    def _load(self):
+        """Restore unexpired entries persisted by a previous process."""
+        if not os.path.exists(self.path):
+            return
+        now = time.time()
+        try:
+            with open(self.path, 'r') as f:
+                for line in f:
+                    try:
+                        created_at, key_hash, embedding, response = json.loads(line)
+                    except (ValueError, TypeError):
+                        continue
+                    if now - created_at <= self.ttl:
+                        self._entries[self._next_id] = (created_at, key_hash, embedding, response)
+                        self._next_id += 1
+        except OSError as e:
+            print(f"Could not load semantic cache {self.path}: {e}")
+            return
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._compact()
+
+    def _append(self, entry: tuple):
+        """Append one entry to the cache file (a single write per line)."""
+        line = json.dumps(entry) + "\n"
+        try:
+            with self._file_lock:
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                with open(self.path, 'a') as f:
+                    f.write(line)
+        except OSError as e:
+            print(f"Could not persist semantic cache {self.path}: {e}")
+
+    def _compact(self):
+        """Rewrite the cache file with only the entries that survived loading."""
+        try:
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                for entry in self._entries.values():
+                    f.write(json.dumps(entry) + "\n")
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Could not compact semantic cache {self.path}: {e}")
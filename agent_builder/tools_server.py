@@ -6,9 +6,9 @@ Deploy this server to provide tools that Agent Builder can call.
 
 import os
 import sys
-from flask import Flask, request, jsonify
-from dotenv import load_dotenv
-from openai import OpenAI
+import time
+import orjson
+from flask import Flask, Response, request
 
 # Add parent directory to path for local and deployed environments
 parent_dir = os.path.join(os.path.dirname(__file__), '..')
@@ -20,30 +20,82 @@ root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if root_dir not in sys.path:
     sys.path.insert(0, root_dir)
 
-from src.tools.rss_fetcher import fetch_rss_feeds
-from src.tools.gnews_fetcher import fetch_gnews
-from src.tools.linkedin_poster import post_to_linkedin, validate_linkedin_token
-from src.tools.article_fetcher import fetch_article_content
 from src.agents.prompts import CONTENT_WRITER_PROMPT, NEWS_CURATOR_PROMPT
+from agent_builder.pipeline import (
+    client,
+    curated_urls,
+    fetch_all_articles,
+    fetch_articles_parallel,
+    make_semantic_caches,
+    post_to_linkedin,
+    prefetch_articles,
+    summary_budget,
+    truncate_tokens,
+    validate_linkedin_token,
+)
 
-load_dotenv()
 
 app = Flask(__name__)
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
+# Own cache files, so the server and the openai_agent CLI don't overwrite each other
+_curator_cache, _writer_cache = make_semantic_caches("server")
+
+# LinkedIn tokens live ~60 days, so a successful validation is reused for a
+# few minutes instead of costing a /userinfo round-trip on every post
+VALIDATION_TTL = 300
+_VALIDATE_CACHE = {"ts": 0.0, "result": None}
+
+
+def _json(data, status: int = 200) -> Response:
+    """JSON response encoded with orjson (much faster than jsonify on large article lists)."""
+    return Response(orjson.dumps(data), status=status, mimetype="application/json")
+
+
+def _validate_linkedin_token_cached() -> dict:
+    """validate_linkedin_token(), reusing a successful result for VALIDATION_TTL seconds."""
+    if _VALIDATE_CACHE["result"] and time.monotonic() - _VALIDATE_CACHE["ts"] < VALIDATION_TTL:
+        return _VALIDATE_CACHE["result"]
+
+    validation = validate_linkedin_token()
+    if validation.get('valid'):
+        _VALIDATE_CACHE.update(ts=time.monotonic(), result=validation)
+    return validation
+
+
+def _post_to_linkedin_checked(content: str) -> dict:
+    """post_to_linkedin(), dropping the cached validation if LinkedIn rejects the token."""
+    result = post_to_linkedin(content)
+    if result.get('status_code') == 401:
+        _VALIDATE_CACHE.update(ts=0.0, result=None)
+    return result
+
+
+def call_openai(
+    prompt: str,
+    system_message: str = None,
+    cache=None,
+    cache_key: str = None,
+    response_format: dict = None,
+) -> str:
+    """Call OpenAI API, optionally through a semantic cache keyed by cache_key."""
+    if cache is not None:
+        return cache.get_or_create(
+            cache_key or prompt,
+            lambda: call_openai(prompt, system_message, response_format=response_format),
+        )
 
-def call_openai(prompt: str, system_message: str = None) -> str:
-    """Call OpenAI API."""
     messages = []
     if system_message:
         messages.append({"role": "system", "content": system_message})
     messages.append({"role": "user", "content": prompt})
 
+    kwargs = {"response_format": response_format} if response_format else {}
     response = client.chat.completions.create(
         model="gpt-4o",
         messages=messages,
         temperature=0.7,
         max_tokens=4000,
+        **kwargs,
     )
     return response.choices[0].message.content
 
@@ -51,7 +103,7 @@ def call_openai(prompt: str, system_message: str = None) -> str:
 @app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint."""
-    return jsonify({
+    return _json({
         "status": "healthy",
         "openai_key_set": bool(os.getenv("OPENAI_API_KEY")),
         "gnews_key_set": bool(os.getenv("GNEWS_API_KEY")),
@@ -66,9 +118,7 @@ def fetch_ai_news():
         data = request.json or {}
         hours_back = data.get('hours_back', 48)
 
-        rss_articles = fetch_rss_feeds(hours_back=hours_back)
-        gnews_articles = fetch_gnews()
-        all_articles = rss_articles + gnews_articles
+        all_articles = fetch_all_articles(hours_back)
 
         formatted = []
         for article in all_articles:
@@ -80,14 +130,92 @@ def fetch_ai_news():
                 "source": article["source"]
             })
 
-        return jsonify({
+        return _json({
             "success": True,
             "article_count": len(formatted),
             "articles": formatted
         })
 
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+        return _json({"success": False, "error": str(e)}, 500)
+
+
+def _generate_post_impl(
+    hours_back: int = 48,
+    max_articles: int = None,
+    summary_tokens: int = None,
+    max_urls: int = 4,
+    content_chars: int = 2000,
+    log_prefix: str = "generate_post",
+) -> dict:
+    """
+    Fetch news -> Curate -> Fetch full content -> Generate human-like post.
+
+    Plain-Python core shared by the generate_post and full_workflow endpoints.
+    Returns a dict with success, post and articles_used (or error).
+    """
+    # Step 1: Fetch all articles
+    print(f"[{log_prefix}] Step 1: Fetching articles...")
+    all_articles = fetch_all_articles(hours_back)
+    print(f"[{log_prefix}] Found {len(all_articles)} articles")
+
+    if not all_articles:
+        return {"success": False, "error": "No articles found"}
+
+    candidates = all_articles[:max_articles] if max_articles else all_articles
+    summary_tokens = summary_tokens or summary_budget(len(candidates))
+
+    # Format articles for curation
+    parts = [f"Found {len(all_articles)} articles:\n\n"]
+    for i, article in enumerate(candidates, 1):
+        parts.append(
+            f"--- Article {i} ---\n"
+            f"Source: {article['source']}\n"
+            f"Title: {article['title']}\n"
+            f"URL: {article['url']}\n"
+            f"Summary: {truncate_tokens(article['summary'], summary_tokens)}\n\n"
+        )
+    articles_text = "".join(parts)
+
+    # Step 2: Curate best articles
+    print(f"[{log_prefix}] Step 2: Calling OpenAI for curation...")
+    prefetched = prefetch_articles(candidates, content_chars)
+    curator_prompt = NEWS_CURATOR_PROMPT.format(articles=articles_text)
+    curated = call_openai(
+        curator_prompt,
+        "Select the most interesting AI news for developers.",
+        cache=_curator_cache,
+        cache_key=articles_text,
+        response_format={"type": "json_object"},
+    )
+    print(f"[{log_prefix}] Curation complete")
+
+    # Step 3: Fetch full content from curated URLs
+    print(f"[{log_prefix}] Step 3: Fetching full article content...")
+    urls = curated_urls(curated, max_urls)
+
+    parts = [curated, "\n\nFULL ARTICLE CONTENT:\n"]
+    for article in fetch_articles_parallel(urls, content_chars, prefetched):
+        parts.append(f"\n=== {article['title']} ===\n{article['content'][:content_chars]}\n")
+    full_content = "".join(parts)
+    print(f"[{log_prefix}] Fetched {len(urls)} articles")
+
+    # Step 4: Generate human-like post
+    print(f"[{log_prefix}] Step 4: Calling OpenAI to generate post...")
+    writer_prompt = CONTENT_WRITER_PROMPT.format(curated_articles=full_content)
+    post_content = call_openai(
+        writer_prompt,
+        "Write like a real human, not an AI.",
+        cache=_writer_cache,
+        cache_key=full_content,
+    )
+    print(f"[{log_prefix}] Post generated successfully")
+
+    return {
+        "success": True,
+        "post": post_content,
+        "articles_used": len(urls)
+    }
 
 
 @app.route('/tools/generate_post', methods=['POST'])
@@ -99,59 +227,13 @@ def generate_post():
         data = request.json or {}
         hours_back = data.get('hours_back', 48)
 
-        # Step 1: Fetch all articles
-        print("[generate_post] Step 1: Fetching articles...")
-        rss_articles = fetch_rss_feeds(hours_back=hours_back)
-        gnews_articles = fetch_gnews()
-        all_articles = rss_articles + gnews_articles
-        print(f"[generate_post] Found {len(all_articles)} articles")
-
-        if not all_articles:
-            return jsonify({"success": False, "error": "No articles found"})
-
-        # Format articles for curation
-        articles_text = f"Found {len(all_articles)} articles:\n\n"
-        for i, article in enumerate(all_articles, 1):
-            articles_text += f"--- Article {i} ---\n"
-            articles_text += f"Source: {article['source']}\n"
-            articles_text += f"Title: {article['title']}\n"
-            articles_text += f"URL: {article['url']}\n"
-            articles_text += f"Summary: {article['summary'][:800]}\n\n"
-
-        # Step 2: Curate best articles
-        print("[generate_post] Step 2: Calling OpenAI for curation...")
-        curator_prompt = NEWS_CURATOR_PROMPT.format(articles=articles_text)
-        curated = call_openai(curator_prompt, "Select the most interesting AI news for developers.")
-        print("[generate_post] Curation complete")
-
-        # Step 3: Fetch full content from curated URLs
-        print("[generate_post] Step 3: Fetching full article content...")
-        import re
-        urls = re.findall(r'https?://[^\s<>"{}|\\^`\[\]]+', curated)[:4]
-
-        full_content = curated + "\n\nFULL ARTICLE CONTENT:\n"
-        for url in urls:
-            article = fetch_article_content(url.rstrip(')'), 2000)
-            full_content += f"\n=== {article['title']} ===\n{article['content'][:2000]}\n"
-        print(f"[generate_post] Fetched {len(urls)} articles")
-
-        # Step 4: Generate human-like post
-        print("[generate_post] Step 4: Calling OpenAI to generate post...")
-        writer_prompt = CONTENT_WRITER_PROMPT.format(curated_articles=full_content)
-        post_content = call_openai(writer_prompt, "Write like a real human, not an AI.")
-        print("[generate_post] Post generated successfully")
-
-        return jsonify({
-            "success": True,
-            "post": post_content,
-            "articles_used": len(urls)
-        })
+        return _json(_generate_post_impl(hours_back))
 
     except Exception as e:
         import traceback
         print(f"[generate_post] ERROR: {str(e)}")
         print(traceback.format_exc())
-        return jsonify({"success": False, "error": str(e)}), 500
+        return _json({"success": False, "error": str(e)}, 500)
 
 
 @app.route('/tools/post_to_linkedin', methods=['POST'])
@@ -161,22 +243,22 @@ def linkedin_post():
         data = request.json
 
         if not data or 'content' not in data:
-            return jsonify({"success": False, "error": "Missing 'content' field"}), 400
+            return _json({"success": False, "error": "Missing 'content' field"}, 400)
 
         content = data['content']
 
-        validation = validate_linkedin_token()
+        validation = _validate_linkedin_token_cached()
         if not validation.get('valid'):
-            return jsonify({
+            return _json({
                 "success": False,
                 "error": "LinkedIn token is invalid or expired"
-            }), 401
+            }, 401)
 
-        result = post_to_linkedin(content)
-        return jsonify(result)
+        result = _post_to_linkedin_checked(content)
+        return _json(result)
 
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+        return _json({"success": False, "error": str(e)}, 500)
 
 
 @app.route('/tools/full_workflow', methods=['POST'])
@@ -185,86 +267,59 @@ def full_workflow():
     Complete workflow: Generate post and optionally post to LinkedIn.
     """
     try:
-        import re
         data = request.json or {}
         hours_back = data.get('hours_back', 48)
         auto_post = data.get('auto_post', False)
 
         print("[full_workflow] Starting workflow...")
 
-        # Step 1: Fetch articles
-        print("[full_workflow] Fetching articles...")
-        rss_articles = fetch_rss_feeds(hours_back=hours_back)
-        gnews_articles = fetch_gnews()
-        all_articles = rss_articles + gnews_articles
-
-        if not all_articles:
-            return jsonify({"success": False, "error": "No articles found"})
-
-        print(f"[full_workflow] Found {len(all_articles)} articles")
-
-        # Format for curation
-        articles_text = f"Found {len(all_articles)} articles:\n\n"
-        for i, article in enumerate(all_articles[:15], 1):
-            articles_text += f"--- Article {i} ---\n"
-            articles_text += f"Source: {article['source']}\n"
-            articles_text += f"Title: {article['title']}\n"
-            articles_text += f"URL: {article['url']}\n"
-            articles_text += f"Summary: {article['summary'][:500]}\n\n"
-
-        # Step 2: Curate
-        print("[full_workflow] Curating articles...")
-        curator_prompt = NEWS_CURATOR_PROMPT.format(articles=articles_text)
-        curated = call_openai(curator_prompt, "Select the most interesting AI news for developers.")
-
-        # Step 3: Get URLs and fetch content
-        print("[full_workflow] Fetching full content...")
-        urls = re.findall(r'https?://[^\s<>"{}|\\^`\[\]]+', curated)[:3]
-        full_content = curated + "\n\nFULL ARTICLE CONTENT:\n"
-        for url in urls:
-            article = fetch_article_content(url.rstrip(')'), 1500)
-            full_content += f"\n=== {article['title']} ===\n{article['content'][:1500]}\n"
-
-        # Step 4: Generate post
-        print("[full_workflow] Generating post...")
-        writer_prompt = CONTENT_WRITER_PROMPT.format(curated_articles=full_content)
-        post_content = call_openai(writer_prompt, "Write like a real human, not an AI.")
-
-        print("[full_workflow] Post generated successfully")
+        # Smaller prompt and fewer full articles keep the scheduled run within its timeout
+        generated = _generate_post_impl(
+            hours_back,
+            max_articles=15,
+            summary_tokens=125,
+            max_urls=3,
+            content_chars=1500,
+            log_prefix="full_workflow",
+        )
+        if not generated["success"]:
+            return _json(generated)
+
+        post_content = generated["post"]
 
         # Auto-post if requested
         if auto_post:
             print("[full_workflow] Posting to LinkedIn...")
-            validation = validate_linkedin_token()
+            validation = _validate_linkedin_token_cached()
             if not validation.get('valid'):
-                return jsonify({
+                return _json({
                     "success": False,
                     "post": post_content,
                     "error": "LinkedIn token invalid - post generated but not published"
                 })
 
-            result = post_to_linkedin(post_content)
-            return jsonify({
+            result = _post_to_linkedin_checked(post_content)
+            return _json({
                 "success": result.get('success', False),
                 "post": post_content,
                 "linkedin_result": result
             })
 
-        return jsonify({
+        return _json({
             "success": True,
             "post": post_content,
             "message": "Post generated. Set auto_post=true to publish."
         })
 
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+        return _json({"success": False, "error": str(e)}, 500)
 
 
 @app.route('/tools/validate_linkedin', methods=['GET'])
 def validate_linkedin():
     """Validate LinkedIn access token."""
     result = validate_linkedin_token()
-    return jsonify(result)
+    return _json(result)
 
 
 # OpenAI Function Definitions
@@ -314,11 +369,12 @@ TOOL_DEFINITIONS = [
 @app.route('/openai/tools', methods=['GET'])
 def get_tool_definitions():
     """Get OpenAI function definitions."""
-    return jsonify(TOOL_DEFINITIONS)
+    return _json(TOOL_DEFINITIONS)
 
 
 if __name__ == '__main__':
     port = int(os.getenv('PORT', 5000))
+    debug = os.getenv('FLASK_DEBUG', '0') == '1'
     print(f"\n{'='*60}")
     print("  LINKEDIN AI AUTO-POSTER - TOOLS SERVER")
     print(f"{'='*60}")
@@ -329,6 +385,10 @@ if __name__ == '__main__':
     print(f"  POST /tools/post_to_linkedin - Post to LinkedIn")
     print(f"  POST /tools/full_workflow   - Full workflow")
     print(f"  GET  /openai/tools          - Tool definitions")
+    print(f"\nThis is the single-process dev server. In production run:")
+    print(f"  gunicorn agent_builder.tools_server:app -k gevent --worker-connections 100")
     print(f"\n{'='*60}\n")
 
-    app.run(host='0.0.0.0', port=port, debug=True)
+    # Debug mode (tracebacks in responses) only when FLASK_DEBUG=1; the reloader
+    # would fork a second process and watch the tree, so it stays off
+    app.run(host='0.0.0.0', port=port, debug=debug, use_reloader=False)
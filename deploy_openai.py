@@ -4,24 +4,57 @@ Deploy LinkedIn Auto-Poster to OpenAI Assistants API
 Everything runs through OpenAI - no external hosting needed.
 """
 
+import atexit
 import os
 import sys
 import json
-import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from openai import OpenAI
 from dotenv import load_dotenv
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from tools.rss_fetcher import fetch_rss_feeds
-from tools.gnews_fetcher import fetch_gnews
-from tools.linkedin_poster import post_to_linkedin
-from tools.article_fetcher import fetch_article_content
+from tools.dedupe import dedupe_articles
+
+
+# The fetchers pull in feedparser, BeautifulSoup etc.; import them on first use
+# so create/delete commands don't load the fetchers at all.
+@lru_cache(maxsize=1)
+def _rss():
+    from tools.rss_fetcher import fetch_rss_feeds
+    return fetch_rss_feeds
+
+
+@lru_cache(maxsize=1)
+def _gnews():
+    from tools.gnews_fetcher import fetch_gnews
+    return fetch_gnews
+
+
+@lru_cache(maxsize=1)
+def _article_content():
+    from tools.article_fetcher import fetch_article_content
+    return fetch_article_content
+
+
+@lru_cache(maxsize=1)
+def _post_to_linkedin():
+    from tools.linkedin_poster import post_to_linkedin
+    return post_to_linkedin
+
 
 load_dotenv()
 
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
+# Shared pool so the RSS and GNews fetches overlap instead of running back to back
+_POOL = ThreadPoolExecutor(max_workers=2)
+atexit.register(_POOL.shutdown)
+
+# Upper bound on tool calls executed at once when the assistant requests several
+MAX_PARALLEL_TOOL_CALLS = 8
+
 # Assistant configuration
 ASSISTANT_NAME = "LinkedIn AI News Poster"
 ASSISTANT_MODEL = "gpt-4o"
@@ -116,9 +149,9 @@ def handle_tool_call(tool_name, arguments):
     if tool_name == "fetch_ai_news":
         hours_back = arguments.get("hours_back", 48)
 
-        rss = fetch_rss_feeds(hours_back=hours_back)
-        gnews = fetch_gnews()
-        all_articles = rss + gnews
+        rss_future = _POOL.submit(_rss(), hours_back=hours_back)
+        gnews_future = _POOL.submit(_gnews())
+        all_articles = dedupe_articles(rss_future.result() + gnews_future.result())
 
         # Format for assistant
         result = []
@@ -134,12 +167,12 @@ def handle_tool_call(tool_name, arguments):
 
     elif tool_name == "fetch_full_article":
         url = arguments.get("url", "")
-        article = fetch_article_content(url, max_length=2000)
+        article = _article_content()(url, max_length=2000)
         return json.dumps(article)
 
     elif tool_name == "post_to_linkedin":
         content = arguments.get("content", "")
-        result = post_to_linkedin(content)
+        result = _post_to_linkedin()(content)
         return json.dumps(result)
 
     return json.dumps({"error": f"Unknown tool: {tool_name}"})
@@ -208,53 +241,54 @@ def run_assistant(auto_post=False):
         content=user_message
     )
 
-    # Run assistant
-    run = client.beta.threads.runs.create(
+    print("Running assistant...")
+
+    # Stream run events instead of polling: the server pushes requires_action
+    # and the terminal state the moment they happen.
+    stream = client.beta.threads.runs.stream(
         thread_id=thread.id,
         assistant_id=assistant.id
     )
 
-    print("Running assistant...")
-
-    # Poll for completion
     while True:
-        run = client.beta.threads.runs.retrieve(
-            thread_id=thread.id,
-            run_id=run.id
-        )
+        pending_run = None
+
+        with stream as events:
+            for event in events:
+                if event.event == "thread.run.requires_action":
+                    pending_run = event.data
 
-        if run.status == "completed":
+                elif event.event in ("thread.run.failed", "thread.run.cancelled", "thread.run.expired"):
+                    run = event.data
+                    print(f"Run failed: {run.status}")
+                    if run.last_error:
+                        print(f"Error: {run.last_error}")
+                    return None
+
+        if pending_run is None:
             break
 
-        elif run.status == "requires_action":
-            # Handle tool calls
-            tool_outputs = []
+        # Handle tool calls (independent of each other, so run them concurrently)
+        tool_calls = pending_run.required_action.submit_tool_outputs.tool_calls
 
-            for tool_call in run.required_action.submit_tool_outputs.tool_calls:
+        with ThreadPoolExecutor(max_workers=min(len(tool_calls), MAX_PARALLEL_TOOL_CALLS)) as executor:
+            futures = {}
+            for tool_call in tool_calls:
                 print(f"  Calling: {tool_call.function.name}")
-
                 args = json.loads(tool_call.function.arguments)
-                result = handle_tool_call(tool_call.function.name, args)
-
-                tool_outputs.append({
-                    "tool_call_id": tool_call.id,
-                    "output": result
-                })
-
-            # Submit results
-            run = client.beta.threads.runs.submit_tool_outputs(
-                thread_id=thread.id,
-                run_id=run.id,
-                tool_outputs=tool_outputs
-            )
-
-        elif run.status in ["failed", "cancelled", "expired"]:
-            print(f"Run failed: {run.status}")
-            if run.last_error:
-                print(f"Error: {run.last_error}")
-            return None
-
-        time.sleep(1)
+                futures[executor.submit(handle_tool_call, tool_call.function.name, args)] = tool_call
+
+            tool_outputs = [
+                {"tool_call_id": futures[future].id, "output": future.result()}
+                for future in as_completed(futures)
+            ]
+
+        # Submit results and keep streaming the resumed run
+        stream = client.beta.threads.runs.submit_tool_outputs_stream(
+            thread_id=thread.id,
+            run_id=pending_run.id,
+            tool_outputs=tool_outputs
+        )
 
     # Get final message
     messages = client.beta.threads.messages.list(thread_id=thread.id)
@@ -4,11 +4,16 @@ LinkedIn OAuth Token Generator
 Run this script to get your LinkedIn access token.
 """
 
+import atexit
+import html
 import os
+import re
+import socket
+import stat
+import tempfile
 import webbrowser
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from urllib.parse import urlparse, parse_qs
-import requests
+from urllib.parse import urlparse, parse_qs, urlencode
+import httpx
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -28,47 +33,68 @@ REDIRECT_URI = f"http://localhost:{PORT}/callback"
 # Scopes needed for posting
 SCOPES = "openid profile w_member_social"
 
+# Shared HTTP/2 client so the token exchange and any follow-up LinkedIn calls
+# share one TLS connection (multiplexed streams, HPACK-compressed headers)
+SESSION = httpx.Client(http2=True, timeout=10.0)
+atexit.register(SESSION.close)
 
-class OAuthHandler(BaseHTTPRequestHandler):
-    """Handle the OAuth callback."""
-
-    def do_GET(self):
-        """Handle GET request from LinkedIn callback."""
-        parsed = urlparse(self.path)
-
-        if parsed.path == "/callback":
-            query_params = parse_qs(parsed.query)
-
-            if "code" in query_params:
-                auth_code = query_params["code"][0]
-                self.server.auth_code = auth_code
-
-                # Send success response
-                self.send_response(200)
-                self.send_header("Content-type", "text/html")
-                self.end_headers()
-                self.wfile.write(b"""
-                    <html>
-                    <body style="font-family: Arial; text-align: center; padding-top: 50px;">
-                        <h1>Authorization Successful!</h1>
-                        <p>You can close this window and return to the terminal.</p>
-                    </body>
-                    </html>
-                """)
-            else:
-                error = query_params.get("error", ["Unknown error"])[0]
-                self.send_response(400)
-                self.send_header("Content-type", "text/html")
-                self.end_headers()
-                self.wfile.write(f"<h1>Error: {error}</h1>".encode())
-                self.server.auth_code = None
-        else:
-            self.send_response(404)
-            self.end_headers()
 
-    def log_message(self, format, *args):
-        """Suppress server logs."""
-        pass
+# The OAuth callback is a single GET, so a raw socket is enough to receive it
+_REQUEST_LINE_RE = re.compile(r'^GET (\S+) HTTP/')
+
+SUCCESS_PAGE = b"""
+    <html>
+    <body style="font-family: Arial; text-align: center; padding-top: 50px;">
+        <h1>Authorization Successful!</h1>
+        <p>You can close this window and return to the terminal.</p>
+    </body>
+    </html>
+"""
+
+
+def _send_response(conn, status: str, body: bytes = b""):
+    conn.sendall(
+        f"HTTP/1.1 {status}\r\n"
+        f"Content-Type: text/html\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: close\r\n\r\n".encode() + body
+    )
+
+
+def wait_for_callback() -> str:
+    """
+    Accept connections on PORT until LinkedIn redirects to /callback.
+
+    Returns the authorization code, or None if LinkedIn returned an error.
+    Other requests (e.g. the browser asking for /favicon.ico) get a 404.
+    """
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    server.bind(("localhost", PORT))
+    server.listen(1)
+
+    try:
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                data = conn.recv(4096).decode("latin-1")
+                match = _REQUEST_LINE_RE.match(data)
+                parsed = urlparse(match.group(1)) if match else None
+
+                if not parsed or parsed.path != "/callback":
+                    _send_response(conn, "404 Not Found")
+                    continue
+
+                query_params = parse_qs(parsed.query)
+                if "code" in query_params:
+                    _send_response(conn, "200 OK", SUCCESS_PAGE)
+                    return query_params["code"][0]
+
+                error = query_params.get("error", ["Unknown error"])[0]
+                _send_response(conn, "400 Bad Request", f"<h1>Error: {html.escape(error)}</h1>".encode())
+                return None
+    finally:
+        server.close()
 
 
 def get_authorization_url():
@@ -81,8 +107,7 @@ def get_authorization_url():
         "state": "random_state_string"  # In production, use a random value
     }
 
-    query_string = "&".join(f"{k}={v}" for k, v in params.items())
-    return f"{AUTHORIZATION_URL}?{query_string}"
+    return f"{AUTHORIZATION_URL}?{urlencode(params)}"
 
 
 def exchange_code_for_token(auth_code: str) -> dict:
@@ -101,11 +126,47 @@ def exchange_code_for_token(auth_code: str) -> dict:
     print(f"  redirect_uri: {REDIRECT_URI}")
     print(f"  code: {auth_code[:20]}...")
 
-    response = requests.post(TOKEN_URL, data=data)
+    response = SESSION.post(TOKEN_URL, data=data)
     print(f"  Response status: {response.status_code}")
     return response.json()
 
 
+def update_env_token(env_path: str, access_token: str):
+    """
+    Set LINKEDIN_ACCESS_TOKEN in an existing .env file.
+
+    The file is copied line by line into a temp file next to it, then swapped
+    in atomically. Symlinks are resolved so the link survives, and the temp
+    file gets the original mode before any secret is written to it.
+    """
+    env_path = os.path.realpath(env_path)
+    mode = stat.S_IMODE(os.stat(env_path).st_mode)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(env_path), prefix=".env.")
+    try:
+        os.fchmod(fd, mode)
+        token_line = f"LINKEDIN_ACCESS_TOKEN={access_token}\n"
+        found = False
+        line = "\n"
+        with os.fdopen(fd, 'w') as dst, open(env_path, 'r') as src:
+            for line in src:
+                if line.startswith("LINKEDIN_ACCESS_TOKEN="):
+                    dst.write(token_line)
+                    found = True
+                else:
+                    dst.write(line)
+            if not found:
+                if not line.endswith("\n"):
+                    dst.write("\n")
+                dst.write(token_line)
+        os.replace(tmp_path, env_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
 def main():
     print("\n" + "=" * 60)
     print("  LINKEDIN ACCESS TOKEN GENERATOR")
@@ -134,12 +195,9 @@ def main():
 
     # Start local server to receive callback
     print("Waiting for authorization callback...")
-    server = HTTPServer(("localhost", PORT), OAuthHandler)
-    server.socket.setsockopt(__import__('socket').SOL_SOCKET, __import__('socket').SO_REUSEADDR, 1)
-    server.auth_code = None
-    server.handle_request()  # Handle single request
+    auth_code = wait_for_callback()
 
-    if not server.auth_code:
+    if not auth_code:
         print("\nERROR: No authorization code received")
         return
 
@@ -147,7 +205,7 @@ def main():
     print("Exchanging code for access token...")
 
     # Exchange code for token
-    token_response = exchange_code_for_token(server.auth_code)
+    token_response = exchange_code_for_token(auth_code)
 
     if "access_token" in token_response:
         access_token = token_response["access_token"]
@@ -169,27 +227,8 @@ def main():
         if update.lower() == 'y':
             env_path = os.path.join(os.path.dirname(__file__), '.env')
 
-            # Read existing .env
             if os.path.exists(env_path):
-                with open(env_path, 'r') as f:
-                    content = f.read()
-
-                # Replace the token line
-                if "LINKEDIN_ACCESS_TOKEN=" in content:
-                    lines = content.split('\n')
-                    new_lines = []
-                    for line in lines:
-                        if line.startswith("LINKEDIN_ACCESS_TOKEN="):
-                            new_lines.append(f"LINKEDIN_ACCESS_TOKEN={access_token}")
-                        else:
-                            new_lines.append(line)
-                    content = '\n'.join(new_lines)
-                else:
-                    content += f"\nLINKEDIN_ACCESS_TOKEN={access_token}"
-
-                with open(env_path, 'w') as f:
-                    f.write(content)
-
+                update_env_token(env_path, access_token)
                 print(f"\n.env file updated!")
             else:
                 print("\n.env file not found. Please create it manually.")
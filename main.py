@@ -5,8 +5,10 @@ Orchestrates the complete workflow: fetch news -> curate -> write -> verify -> p
 """
 
 import os
+import re
 import sys
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from dotenv import load_dotenv
 from openai import OpenAI
@@ -18,19 +20,75 @@ from tools.rss_fetcher import fetch_rss_feeds, fetch_rss_feeds_as_text
 from tools.gnews_fetcher import fetch_gnews, fetch_gnews_as_text
 from tools.linkedin_poster import post_to_linkedin, validate_linkedin_token
 from tools.article_fetcher import fetch_article_content, fetch_multiple_articles
+from tools.dedupe import dedupe_articles
 from agents.prompts import get_curator_prompt, get_writer_prompt, get_verifier_prompt
 
 
 # Load environment variables
 load_dotenv()
 
+# Read credentials once at import
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+LINKEDIN_ACCESS_TOKEN = os.getenv("LINKEDIN_ACCESS_TOKEN")
+
 # Initialize OpenAI client
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+client = OpenAI(api_key=OPENAI_API_KEY)
+
+# URLs in curator output (compiled once instead of per call)
+_URL_RE = re.compile(r'https?://[^\s<>"{}|\\^`\[\]]+')
+
+# Per-claim "Status: VERIFIED/UNVERIFIED" lines in a lowercased verification
+# report, tolerating markdown bold around the label or the value
+_STATUS_RE = re.compile(r'status\**:[*\s]*(verified|unverified)')
+
+# PASSED overall status or PUBLISH recommendation in a lowercased report
+_PASS_RE = re.compile(r'overall status\**:[*\s]*passed|recommendation\**:[*\s]*publish')
+
+# Output directories already created by this process
+_READY_DIRS = set()
+
+
+def _ensure_dir(path: str):
+    """Create an output directory once per process."""
+    if path not in _READY_DIRS:
+        os.makedirs(path, exist_ok=True)
+        _READY_DIRS.add(path)
+
 
+def _ensure_dirs():
+    """Create the drafts/ and logs/ output directories at startup."""
+    _ensure_dir("drafts")
+    _ensure_dir("logs")
 
-def call_agent(prompt: str, system_message: str = None, model: str = "gpt-4o") -> str:
+
+def _format_curation(curated: str) -> str:
+    """Turn the curator's {"urls": [...], "notes": "..."} JSON into readable text for later steps."""
+    try:
+        data = json.loads(curated)
+        urls = data.get("urls") or []
+        notes = data.get("notes", "")
+    except (ValueError, AttributeError):
+        return curated
+    urls = [url for url in urls if isinstance(url, str)] if isinstance(urls, list) else []
+    if not isinstance(notes, str):
+        notes = json.dumps(notes, indent=2)
+    return notes + "\n\nSelected article URLs:\n" + "\n".join(urls)
+
+
+def call_agent(
+    prompt: str,
+    system_message: str = None,
+    model: str = "gpt-4o",
+    stream: bool = False,
+    on_line=None,
+    response_format: dict = None,
+) -> str:
     """
     Call OpenAI API with the given prompt.
+
+    With stream=True the response is consumed as it is generated and each
+    completed line is passed to on_line (if given); the full text is still
+    returned at the end.
     """
     messages = []
 
@@ -39,50 +97,79 @@ def call_agent(prompt: str, system_message: str = None, model: str = "gpt-4o") -
 
     messages.append({"role": "user", "content": prompt})
 
-    response = client.chat.completions.create(
-        model=model,
-        messages=messages,
-        temperature=0.7,
-        max_tokens=4000,
-    )
+    request = {
+        "model": model,
+        "messages": messages,
+        "temperature": 0.7,
+        "max_tokens": 4000,
+    }
+    if response_format:
+        request["response_format"] = response_format
+
+    if not stream:
+        response = client.chat.completions.create(**request)
+        return response.choices[0].message.content
+
+    pieces = []
+    pending = ""
+    for chunk in client.chat.completions.create(stream=True, **request):
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        if not delta:
+            continue
+        pieces.append(delta)
+        if on_line:
+            *lines, pending = (pending + delta).split("\n")
+            for line in lines:
+                on_line(line)
 
-    return response.choices[0].message.content
+    if on_line and pending:
+        on_line(pending)
 
+    return "".join(pieces)
 
-def step_1_fetch_news(hours_back: int = 48) -> str:
-    """Step 1: Fetch news from all sources."""
+
+def step_1_fetch_news(hours_back: int = 48) -> tuple:
+    """
+    Step 1: Fetch news from all sources.
+
+    Returns:
+        (articles_text, all_articles) with duplicates across sources dropped;
+        articles_text is None when no articles were found
+    """
     print("\n" + "=" * 50)
     print("STEP 1: Fetching news from sources...")
     print("=" * 50)
 
-    # Fetch from RSS feeds
-    print("\nFetching RSS feeds...")
-    rss_articles = fetch_rss_feeds(hours_back=hours_back)
+    # Fetch RSS feeds and GNews concurrently - both are independent network I/O
+    print("\nFetching RSS feeds and GNews API...")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        rss_future = executor.submit(fetch_rss_feeds, hours_back=hours_back)
+        gnews_future = executor.submit(fetch_gnews)
+        rss_articles = rss_future.result()
+        gnews_articles = gnews_future.result()
     print(f"  Found {len(rss_articles)} articles from RSS")
-
-    # Fetch from GNews
-    print("\nFetching from GNews API...")
-    gnews_articles = fetch_gnews()
     print(f"  Found {len(gnews_articles)} articles from GNews")
 
-    # Combine all articles
-    all_articles = rss_articles + gnews_articles
+    # Combine all articles, dropping the same story seen in both sources
+    all_articles = dedupe_articles(rss_articles + gnews_articles)
     print(f"\nTotal articles: {len(all_articles)}")
 
     if not all_articles:
-        return None
+        return None, all_articles
 
     # Format for agent consumption
-    output = f"Found {len(all_articles)} articles:\n\n"
+    parts = [f"Found {len(all_articles)} articles:\n\n"]
     for i, article in enumerate(all_articles, 1):
-        output += f"--- Article {i} ---\n"
-        output += f"Source: {article['source']}\n"
-        output += f"Title: {article['title']}\n"
-        output += f"Date: {article['date']}\n"
-        output += f"URL: {article['url']}\n"
-        output += f"Summary: {article['summary'][:1000]}\n\n"
+        parts.append(
+            f"--- Article {i} ---\n"
+            f"Source: {article['source']}\n"
+            f"Title: {article['title']}\n"
+            f"Date: {article['date']}\n"
+            f"URL: {article['url']}\n"
+            f"Summary: {article['summary'][:1000]}\n\n"
+        )
 
-    return output
+    return "".join(parts), all_articles
 
 
 def step_2_curate_news(articles_text: str) -> str:
@@ -96,9 +183,12 @@ def step_2_curate_news(articles_text: str) -> str:
     system_message = """You are an expert AI news curator for developers.
     Select only the most newsworthy and technically significant articles.
     Be strict - quality over quantity.
-    IMPORTANT: Include the exact URLs for each selected article."""
+    IMPORTANT: Put the exact URL of each selected article in "urls"."""
 
-    curated = call_agent(prompt, system_message)
+    # The curator answers in JSON; the writer and verifier get plain text
+    curated = _format_curation(
+        call_agent(prompt, system_message, response_format={"type": "json_object"})
+    )
 
     print("\nCurated articles selected.")
     return curated
@@ -111,16 +201,15 @@ def step_2b_fetch_full_articles(curated_text: str, all_articles: list) -> str:
     print("=" * 50)
 
     # Extract URLs from curated text
-    import re
-    url_pattern = r'https?://[^\s<>"{}|\\^`\[\]]+'
-    urls = re.findall(url_pattern, curated_text)
+    urls = _URL_RE.findall(curated_text)
 
     # Also get URLs from original articles that match curated titles
     all_urls = set(urls)
+    curated_lower = curated_text.lower()
     for article in all_articles:
         if article.get('url'):
             # Check if this article's title appears in curated text
-            if article.get('title', '')[:30].lower() in curated_text.lower():
+            if article.get('title', '')[:30].lower() in curated_lower:
                 all_urls.add(article['url'])
 
     urls = list(all_urls)[:5]  # Max 5 articles
@@ -175,21 +264,27 @@ def step_4_verify_post(draft_post: str, source_articles: str) -> dict:
     Verify every claim against the source material.
     Be strict - flag any claim that isn't directly supported by sources."""
 
-    verification_report = call_agent(prompt, system_message)
+    # Stream the report and tally claim statuses as lines arrive. The full
+    # report is still needed afterwards (PASS/PUBLISH lines come last, and
+    # step 4b rewrites from it), so the stream is never cut short.
+    statuses = []
+
+    def tally(line):
+        for status in _STATUS_RE.findall(line.lower()):
+            statuses.append(status)
+            print(f"  Claim {len(statuses)}: {status.upper()}")
+
+    verification_report = call_agent(prompt, system_message, stream=True, on_line=tally)
 
     # Parse the result to determine if it passed
     report_lower = verification_report.lower()
 
     # Check for PASSED status or PUBLISH recommendation
-    passed = ("overall status: passed" in report_lower or
-              "recommendation: publish" in report_lower or
-              "recommendation:\npublish" in report_lower)
-
-    # Count verified vs unverified claims (handle markdown formatting)
-    # Remove markdown bold markers for counting
-    report_clean = report_lower.replace("**", "").replace("*", "")
-    verified_count = report_clean.count("status: verified")
-    unverified_count = report_clean.count("status: unverified")
+    passed = bool(_PASS_RE.search(report_lower))
+
+    # Count verified vs unverified claims (the same tally printed while streaming)
+    verified_count = statuses.count("verified")
+    unverified_count = statuses.count("unverified")
     total_claims = verified_count + unverified_count
 
     # Calculate confidence based on verified claims
@@ -298,30 +393,30 @@ def run_workflow(
     Returns:
         Dict with workflow results
     """
+    # One timestamp for the banner, the results, and the draft/log file names
+    now = datetime.now()
+    run_id = now.strftime('%Y%m%d_%H%M%S')
+
     print("\n" + "=" * 60)
     print("  LINKEDIN AI AUTO-POSTER WORKFLOW")
-    print(f"  Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"  Started: {now.strftime('%Y-%m-%d %H:%M:%S')}")
     print("=" * 60)
 
     results = {
-        "started_at": datetime.now().isoformat(),
+        "run_id": run_id,
+        "started_at": now.isoformat(),
         "dry_run": dry_run,
         "steps": {}
     }
 
     # Step 1: Fetch news
-    articles_text = step_1_fetch_news(hours_back)
+    articles_text, all_articles = step_1_fetch_news(hours_back)
     if not articles_text:
         print("\nNo articles found. Skipping post for today.")
         results["status"] = "skipped"
         results["reason"] = "No articles found"
         return results
 
-    # Get the raw articles list for URL extraction
-    rss_articles = fetch_rss_feeds(hours_back=hours_back)
-    gnews_articles = fetch_gnews()
-    all_articles = rss_articles + gnews_articles
-
     results["steps"]["fetch"] = {"articles_found": len(all_articles)}
 
     # Step 2: Curate
@@ -375,8 +470,8 @@ def run_workflow(
             print(f"\nSaving for manual review.")
 
             # Save draft for manual review
-            draft_file = f"drafts/draft_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-            os.makedirs("drafts", exist_ok=True)
+            draft_file = f"drafts/draft_{run_id}.txt"
+            _ensure_dir("drafts")
             with open(draft_file, 'w') as f:
                 f.write("=== DRAFT POST (BEST EFFORT) ===\n\n")
                 f.write(draft_post)
@@ -429,15 +524,21 @@ def main():
         default=85,
         help="Minimum confidence threshold to publish (default: 85)"
     )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Pretty-print the results log (default is compact JSON)"
+    )
 
     args = parser.parse_args()
+    _ensure_dirs()
 
     # Validate environment
-    if not os.getenv("OPENAI_API_KEY"):
+    if not OPENAI_API_KEY:
         print("ERROR: OPENAI_API_KEY not set in environment")
         sys.exit(1)
 
-    if args.post and not os.getenv("LINKEDIN_ACCESS_TOKEN"):
+    if args.post and not LINKEDIN_ACCESS_TOKEN:
         print("ERROR: LINKEDIN_ACCESS_TOKEN not set (required for actual posting)")
         sys.exit(1)
 
@@ -450,10 +551,13 @@ def main():
     )
 
     # Save results
-    results_file = f"logs/run_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    os.makedirs("logs", exist_ok=True)
+    results_file = f"logs/run_{results['run_id']}.json"
+    # results only holds JSON-native values (timestamps are stored as ISO strings)
     with open(results_file, 'w') as f:
-        json.dump(results, f, indent=2, default=str)
+        if args.verbose:
+            json.dump(results, f, indent=2)
+        else:
+            json.dump(results, f, separators=(",", ":"))
     print(f"\nResults saved to: {results_file}")
 
 
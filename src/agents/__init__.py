@@ -2,16 +2,30 @@ from .prompts import (
     NEWS_CURATOR_PROMPT,
     CONTENT_WRITER_PROMPT,
     FACT_VERIFIER_PROMPT,
+    CURATE_AND_WRITE_PROMPT,
+    CURATOR_STATIC_PREFIX,
+    WRITER_STATIC_PREFIX,
+    VERIFIER_STATIC_PREFIX,
+    CURATE_AND_WRITE_STATIC_PREFIX,
+    prefix_key,
     get_curator_prompt,
     get_writer_prompt,
     get_verifier_prompt,
+    get_curate_and_write_prompt,
 )
 
 __all__ = [
     "NEWS_CURATOR_PROMPT",
     "CONTENT_WRITER_PROMPT",
     "FACT_VERIFIER_PROMPT",
+    "CURATE_AND_WRITE_PROMPT",
+    "CURATOR_STATIC_PREFIX",
+    "WRITER_STATIC_PREFIX",
+    "VERIFIER_STATIC_PREFIX",
+    "CURATE_AND_WRITE_STATIC_PREFIX",
+    "prefix_key",
     "get_curator_prompt",
     "get_writer_prompt",
     "get_verifier_prompt",
+    "get_curate_and_write_prompt",
 ]
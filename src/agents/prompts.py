@@ -3,6 +3,9 @@ Agent Prompts for LinkedIn AI Auto-Poster Workflow
 These prompts define the behavior of each agent in the workflow.
 """
 
+import hashlib
+from typing import Dict, List, Tuple, Union
+
 NEWS_CURATOR_PROMPT = """You are an AI News Curator for a developer-focused LinkedIn account.
 
 Your task is to analyze the provided articles and select the TOP 3-5 most interesting and newsworthy items for developers.
@@ -22,11 +25,11 @@ Your task is to analyze the provided articles and select the TOP 3-5 most intere
 - Articles without concrete technical details
 
 ## Output Format:
-For each selected article, provide:
-1. The article title and source
-2. The URL (EXACTLY as provided - do not modify)
-3. A brief explanation of why this is newsworthy for developers
-4. Key technical details to highlight
+Respond with a single JSON object and nothing else:
+{{"urls": ["<url of selected article>", ...], "notes": "<commentary>"}}
+
+- "urls": the URLs of the selected articles, most newsworthy first, EXACTLY as provided - do not modify
+- "notes": for each selected article, the title and source, a brief explanation of why this is newsworthy for developers, and the key technical details to highlight
 
 Select 3-5 articles maximum. Quality over quantity.
 
@@ -191,19 +194,116 @@ PUBLISH (if all verified) / REVISE (if any unverified)
 """
 
 
-def get_curator_prompt(articles_text: str) -> str:
-    """Get the curator prompt with articles inserted."""
+CURATE_AND_WRITE_PROMPT = """You are an AI News Curator AND the writer of a developer-focused LinkedIn account. Do both jobs in one pass.
+
+## Step 1 - Pick the stories
+From the articles below, pick the 2-3 most interesting and newsworthy items for developers:
+- New product launches, models, APIs or tools
+- First-time announcements, not updates to old news
+- Things developers can actually use or build with
+Skip opinion pieces, hiring/funding news and repeated coverage of the same story.
+
+## Step 2 - Write the post
+Write like a real person typing their thoughts. Not a summary. Not a news digest.
+- Start with what caught YOUR attention, then meander through the stories naturally
+- Casual language ("honestly", "kinda", "idk", "tbh"), short paragraphs, lots of line breaks
+- Don't list items as "1. First 2. Second 3. Third"
+- End with a real question you actually want answered
+- Links at bottom. Few hashtags.
+- NEVER use: groundbreaking, revolutionary, game-changer, cutting-edge, excited to share, thrilled, dive in, leverage, utilize, comprehensive, robust, seamless, innovative, transform, empower
+
+## ACCURACY:
+- Facts about the news must come from the articles below
+- Use the URLs EXACTLY as provided - do not modify
+
+## Output Format:
+Respond with a JSON object only:
+{{"chosen_urls": ["<url of each picked article>"], "post": "<the full LinkedIn post>"}}
+
+## Articles to analyze:
+{articles}
+"""
+
+
+# Provider prompt caches (OpenAI automatic caching, Anthropic cache_control)
+# match on the longest identical prefix, so every prompt keeps all of its
+# instructions first and the per-run content last. Each template is split
+# where its dynamic section starts: the static part is plain text that is
+# byte-identical on every run, the dynamic part is still a format template.
+# The *_STATIC_PREFIX strings are public so callers can mark them cacheable.
+def _split_prompt(template: str, marker: str) -> Tuple[str, str]:
+    static, dynamic = template.split(marker, 1)
+    # The static part has no placeholders; format() only unescapes {{ }}
+    return static.format(), marker + dynamic
+
+
+CURATOR_STATIC_PREFIX, _CURATOR_DYNAMIC = _split_prompt(NEWS_CURATOR_PROMPT, "## Articles to analyze:")
+WRITER_STATIC_PREFIX, _WRITER_DYNAMIC = _split_prompt(CONTENT_WRITER_PROMPT, "## Source material:")
+VERIFIER_STATIC_PREFIX, _VERIFIER_DYNAMIC = _split_prompt(FACT_VERIFIER_PROMPT, "## Draft Post to Verify:")
+CURATE_AND_WRITE_STATIC_PREFIX, _CURATE_AND_WRITE_DYNAMIC = _split_prompt(
+    CURATE_AND_WRITE_PROMPT, "## Articles to analyze:"
+)
+
+
+def prefix_key(prefix: str) -> str:
+    """
+    Short stable hash of a static prefix.
+
+    Use it to key anything persisted that was produced with that prompt, so
+    stored results are dropped automatically when the prompt text changes.
+    """
+    return hashlib.sha256(prefix.encode()).hexdigest()[:12]
+
+
+def _content_blocks(static: str, dynamic: str) -> List[Dict]:
+    """Anthropic-style content blocks with the static prefix marked cacheable."""
+    return [
+        {"type": "text", "text": static, "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": dynamic},
+    ]
+
+
+def get_curator_prompt(articles_text: str, cacheable: bool = False) -> Union[str, List[Dict]]:
+    """
+    Get the curator prompt with articles inserted.
+
+    With cacheable=True, returns content blocks whose static prefix carries
+    cache_control, for clients that support explicit prompt caching.
+    """
+    if cacheable:
+        return _content_blocks(CURATOR_STATIC_PREFIX, _CURATOR_DYNAMIC.format(articles=articles_text))
     return NEWS_CURATOR_PROMPT.format(articles=articles_text)
 
 
-def get_writer_prompt(curated_articles: str) -> str:
-    """Get the writer prompt with curated articles inserted."""
+def get_writer_prompt(curated_articles: str, cacheable: bool = False) -> Union[str, List[Dict]]:
+    """Get the writer prompt with curated articles inserted (see get_curator_prompt for cacheable)."""
+    if cacheable:
+        return _content_blocks(WRITER_STATIC_PREFIX, _WRITER_DYNAMIC.format(curated_articles=curated_articles))
     return CONTENT_WRITER_PROMPT.format(curated_articles=curated_articles)
 
 
-def get_verifier_prompt(draft_post: str, source_articles: str) -> str:
-    """Get the verifier prompt with draft and sources inserted."""
+def get_verifier_prompt(
+    draft_post: str,
+    source_articles: str,
+    cacheable: bool = False,
+) -> Union[str, List[Dict]]:
+    """Get the verifier prompt with draft and sources inserted (see get_curator_prompt for cacheable)."""
+    if cacheable:
+        return _content_blocks(
+            VERIFIER_STATIC_PREFIX,
+            _VERIFIER_DYNAMIC.format(draft_post=draft_post, source_articles=source_articles),
+        )
     return FACT_VERIFIER_PROMPT.format(
         draft_post=draft_post,
         source_articles=source_articles
     )
+
+
+def get_curate_and_write_prompt(articles_text: str, cacheable: bool = False) -> Union[str, List[Dict]]:
+    """Get the single-pass curate + write prompt with articles inserted (see get_curator_prompt for cacheable)."""
+    if cacheable:
+        return _content_blocks(
+            CURATE_AND_WRITE_STATIC_PREFIX,
+            _CURATE_AND_WRITE_DYNAMIC.format(articles=articles_text),
+        )
+    return CURATE_AND_WRITE_PROMPT.format(articles=articles_text)
@@ -1,15 +1,26 @@
-from .rss_fetcher import fetch_rss_feeds, fetch_rss_feeds_as_text
-from .gnews_fetcher import fetch_gnews, fetch_gnews_as_text
-from .linkedin_poster import post_to_linkedin, validate_linkedin_token
-from .article_fetcher import fetch_article_content, fetch_multiple_articles
-
-__all__ = [
-    "fetch_rss_feeds",
-    "fetch_rss_feeds_as_text",
-    "fetch_gnews",
-    "fetch_gnews_as_text",
-    "post_to_linkedin",
-    "validate_linkedin_token",
-    "fetch_article_content",
-    "fetch_multiple_articles",
-]
+from importlib import import_module
+
+# Fetchers are imported on first attribute access (PEP 562), so importing one
+# submodule (e.g. src.tools.dedupe) doesn't load feedparser, BeautifulSoup etc.
+_EXPORTS = {
+    "fetch_rss_feeds": ".rss_fetcher",
+    "fetch_rss_feeds_as_text": ".rss_fetcher",
+    "fetch_gnews": ".gnews_fetcher",
+    "fetch_gnews_as_text": ".gnews_fetcher",
+    "post_to_linkedin": ".linkedin_poster",
+    "validate_linkedin_token": ".linkedin_poster",
+    "fetch_article_content": ".article_fetcher",
+    "fetch_multiple_articles": ".article_fetcher",
+    "dedupe_articles": ".dedupe",
+    "canonical_key": ".dedupe",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
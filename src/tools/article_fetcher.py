@@ -3,25 +3,226 @@ Article Content Fetcher
 Fetches full article content from URLs for better context.
 """
 
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import requests
-from bs4 import BeautifulSoup
-from typing import Optional, Dict
+from bs4 import BeautifulSoup, Tag
+from typing import Optional, Dict, List, Tuple
 import re
 
+from .http_session import make_session
+
+
+# Shared HTTP session, reused across fetches and threads. Use this instead of
+# bare requests.get().
+SESSION = make_session()
+
+
+# Upper bound on concurrent article downloads in fetch_multiple_articles
+MAX_FETCH_WORKERS = 8
+
+# Parsed articles are near-static, so successful fetches are reused for an
+# hour: in memory, and on disk so re-runs and other processes skip the fetch too
+ARTICLE_CACHE_TTL = 3600
+ARTICLE_CACHE_MAX_ENTRIES = 1024
+ARTICLE_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), ".cache", "articles"
+)
+
+_article_cache: Dict[str, Tuple[float, Dict[str, str]]] = {}
+_article_cache_lock = threading.Lock()
+# Expired files are swept from ARTICLE_CACHE_DIR at most once per TTL
+_last_disk_sweep = 0.0
+
+
+# clean_text runs on every paragraph, so its patterns are built once:
+# whitespace runs collapse to one space, C0/C1 control characters are dropped
+_WS_RE = re.compile(r'\s+')
+_CTRL_TABLE = dict.fromkeys([*range(0x00, 0x20), *range(0x7f, 0xa0)])
+
 
 def clean_text(text: str) -> str:
     """Clean extracted text."""
-    # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text)
-    # Remove special characters
-    text = re.sub(r'[\x00-\x1f\x7f-\x9f]', '', text)
-    return text.strip()
+    return _WS_RE.sub(' ', text).translate(_CTRL_TABLE).strip()
+
+
+# Page chrome dropped (with everything inside it) before extracting text
+_STRIP_TAGS = frozenset({'script', 'style', 'nav', 'footer', 'header', 'aside', 'form'})
+
+# Elements whose text becomes a content paragraph
+_PARA_TAGS = frozenset({'p', 'h2', 'h3', 'li'})
+
+# Common article containers, highest priority first: the first element (in
+# document order) matching the best-ranked rule is the article, like running
+# select_one('article'), select_one('[role="main"]'), ... in turn
+_CONTAINER_RULES = (
+    ('tag', 'article'),
+    ('role', 'main'),
+    ('class', 'post-content'),
+    ('class', 'article-content'),
+    ('class', 'entry-content'),
+    ('class', 'content-body'),
+    ('tag', 'main'),
+    ('class', 'blog-post'),
+    ('class', 'post-body'),
+)
+_CONTAINER_RANKS = {rule: rank for rank, rule in enumerate(_CONTAINER_RULES)}
+_NO_RANK = len(_CONTAINER_RULES)
+
+
+def _container_rank(tag: Tag) -> int:
+    """Best _CONTAINER_RULES rank the tag matches, or _NO_RANK."""
+    rank = min(
+        _CONTAINER_RANKS.get(('tag', tag.name), _NO_RANK),
+        _CONTAINER_RANKS.get(('role', tag.get('role')), _NO_RANK),
+    )
+    for css_class in tag.get('class') or ():
+        rank = min(rank, _CONTAINER_RANKS.get(('class', css_class), _NO_RANK))
+    return rank
+
+
+def _scan_document(soup: BeautifulSoup) -> Tuple[Optional[Tag], Optional[Tag], List[Tag]]:
+    """
+    Find the title tag, the article container and its paragraphs in one walk.
+
+    _STRIP_TAGS subtrees are skipped during the walk and decomposed afterwards,
+    so paragraph text never includes them. The container falls back to <body>.
+    """
+    h1 = title = body = None
+    best_rank, container = _NO_RANK, None
+    paragraphs = []
+    stripped = []
+
+    # Explicit stack instead of recursion: pre-order, i.e. document order
+    stack = list(reversed(soup.contents))
+    while stack:
+        node = stack.pop()
+        if not isinstance(node, Tag):
+            continue
+
+        name = node.name
+        if name in _STRIP_TAGS:
+            stripped.append(node)
+            continue
+
+        if name in _PARA_TAGS:
+            paragraphs.append(node)
+        elif name == 'h1' and h1 is None:
+            h1 = node
+        elif name == 'title' and title is None:
+            title = node
+        elif name == 'body' and body is None:
+            body = node
+
+        rank = _container_rank(node)
+        if rank < best_rank:
+            best_rank, container = rank, node
+
+        stack.extend(reversed(node.contents))
+
+    for node in stripped:
+        node.decompose()
+
+    container = container or body
+    if container is not None:
+        paragraphs = [p for p in paragraphs if any(parent is container for parent in p.parents)]
+
+    return h1 or title, container, paragraphs
+
+
+def _cache_key(url: str, max_length: int) -> str:
+    return hashlib.blake2b(f"{max_length}:{url}".encode(), digest_size=20).hexdigest()
+
+
+def _cache_path(key: str) -> str:
+    return os.path.join(ARTICLE_CACHE_DIR, f"{key}.json")
+
+
+def _memory_put(key: str, created_at: float, article: Dict[str, str]):
+    with _article_cache_lock:
+        _article_cache.pop(key, None)
+        _article_cache[key] = (created_at, dict(article))
+        # Dicts keep insertion order, so the first key is the oldest entry
+        while len(_article_cache) > ARTICLE_CACHE_MAX_ENTRIES:
+            del _article_cache[next(iter(_article_cache))]
+
+
+def _cache_get(key: str) -> Optional[Dict[str, str]]:
+    with _article_cache_lock:
+        entry = _article_cache.get(key)
+    if entry and time.monotonic() - entry[0] < ARTICLE_CACHE_TTL:
+        return dict(entry[1])
+
+    try:
+        with open(_cache_path(key), 'r') as f:
+            saved_at, article = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    age = time.time() - saved_at
+    if age >= ARTICLE_CACHE_TTL:
+        _remove_quietly(_cache_path(key))
+        return None
+
+    # Keep the original age so a disk hit doesn't extend the TTL
+    _memory_put(key, time.monotonic() - age, article)
+    return dict(article)
+
+
+def _remove_quietly(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _sweep_disk_cache():
+    """Delete cache files older than ARTICLE_CACHE_TTL (throttled to once per TTL)."""
+    global _last_disk_sweep
+    now = time.monotonic()
+    with _article_cache_lock:
+        if now - _last_disk_sweep < ARTICLE_CACHE_TTL:
+            return
+        _last_disk_sweep = now
+
+    cutoff = time.time() - ARTICLE_CACHE_TTL
+    try:
+        with os.scandir(ARTICLE_CACHE_DIR) as entries:
+            for entry in entries:
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        _remove_quietly(entry.path)
+                except OSError:
+                    pass
+    except OSError:
+        pass
+
+
+def _cache_put(key: str, article: Dict[str, str]):
+    _memory_put(key, time.monotonic(), article)
+    _sweep_disk_cache()
+    try:
+        os.makedirs(ARTICLE_CACHE_DIR, exist_ok=True)
+        path = _cache_path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump([time.time(), article], f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Could not persist article cache entry: {e}")
 
 
 def fetch_article_content(url: str, max_length: int = 3000) -> Dict[str, str]:
     """
     Fetch full article content from a URL.
 
+    Successful results are cached in-process and under ARTICLE_CACHE_DIR for
+    ARTICLE_CACHE_TTL seconds; errors are never cached so the next call retries.
+
     Args:
         url: The article URL
         max_length: Maximum content length to return
@@ -29,45 +230,24 @@ def fetch_article_content(url: str, max_length: int = 3000) -> Dict[str, str]:
     Returns:
         Dict with title, content, and url
     """
+    cache_key = _cache_key(url, max_length)
+    cached = _cache_get(cache_key)
+    if cached:
+        return cached
+
     headers = {
         'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
     }
 
     try:
-        response = requests.get(url, headers=headers, timeout=15)
+        response = SESSION.get(url, headers=headers, timeout=15)
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # Remove script, style, nav, footer elements
-        for element in soup(['script', 'style', 'nav', 'footer', 'header', 'aside', 'form']):
-            element.decompose()
-
-        # Try to find the main article content
-        article = None
-
-        # Common article containers
-        selectors = [
-            'article',
-            '[role="main"]',
-            '.post-content',
-            '.article-content',
-            '.entry-content',
-            '.content-body',
-            'main',
-            '.blog-post',
-            '.post-body',
-        ]
-
-        for selector in selectors:
-            article = soup.select_one(selector)
-            if article:
-                break
-
-        # Fallback to body
-        if not article:
-            article = soup.body
+        soup = BeautifulSoup(response.content, 'lxml')
+
+        # Title, main article container and its paragraphs, in a single pass
+        title_tag, article, paragraphs = _scan_document(soup)
 
         if not article:
             return {
@@ -78,18 +258,21 @@ def fetch_article_content(url: str, max_length: int = 3000) -> Dict[str, str]:
 
         # Get title
         title = ""
-        title_tag = soup.find('h1') or soup.find('title')
         if title_tag:
             title = clean_text(title_tag.get_text())
 
-        # Get paragraphs
-        paragraphs = article.find_all(['p', 'h2', 'h3', 'li'])
+        # Get paragraphs, stopping once the joined content already exceeds
+        # max_length (the rest would be truncated away below)
         content_parts = []
+        content_length = -2  # no separator before the first part
 
         for p in paragraphs:
             text = clean_text(p.get_text())
             if len(text) > 30:  # Skip short fragments
                 content_parts.append(text)
+                content_length += len(text) + 2
+                if content_length > max_length:
+                    break
 
         content = '\n\n'.join(content_parts)
 
@@ -97,11 +280,13 @@ def fetch_article_content(url: str, max_length: int = 3000) -> Dict[str, str]:
         if len(content) > max_length:
             content = content[:max_length] + "..."
 
-        return {
+        result = {
             "title": title,
             "content": content,
             "url": url
         }
+        _cache_put(cache_key, result)
+        return result
 
     except requests.exceptions.RequestException as e:
         return {
@@ -121,19 +306,27 @@ def fetch_multiple_articles(urls: list, max_length_per_article: int = 2000) -> s
     """
     Fetch content from multiple URLs and format for agent consumption.
     """
-    output = ""
+    if not urls:
+        return ""
 
     for i, url in enumerate(urls, 1):
         print(f"  Fetching article {i}/{len(urls)}: {url[:50]}...")
-        article = fetch_article_content(url, max_length_per_article)
 
-        output += f"\n{'='*60}\n"
-        output += f"ARTICLE {i}: {article['title']}\n"
-        output += f"URL: {article['url']}\n"
-        output += f"{'='*60}\n"
-        output += f"{article['content']}\n"
+    # Download concurrently (SESSION is shared, so its pool must be at least
+    # MAX_FETCH_WORKERS); map() yields results in the order of urls
+    with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(urls))) as executor:
+        articles = list(executor.map(lambda url: fetch_article_content(url, max_length_per_article), urls))
+
+    parts = []
+
+    for i, article in enumerate(articles, 1):
+        parts.append(f"\n{'='*60}\n")
+        parts.append(f"ARTICLE {i}: {article['title']}\n")
+        parts.append(f"URL: {article['url']}\n")
+        parts.append(f"{'='*60}\n")
+        parts.append(f"{article['content']}\n")
 
-    return output
+    return "".join(parts)
 
 
 if __name__ == "__main__":
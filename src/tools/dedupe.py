@@ -0,0 +1,66 @@
+"""
+Article Deduplication
+Drops repeated stories when RSS feeds and GNews return the same article.
+"""
+
+import hashlib
+from typing import List, Dict, Any
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+
+# Query parameters that only track the referrer and never change the article
+TRACKING_PARAMS = {"fbclid", "gclid", "ref"}
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name.startswith("utm_") or name in TRACKING_PARAMS
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL for comparison: lowercase host, drop fragment and tracking params."""
+    parts = urlsplit(url.strip())
+    query = urlencode([
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(key)
+    ])
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ""))
+
+
+def canonical_key(url: str, title: str) -> str:
+    """
+    Story identity: lowercase host + path (no query, fragment or trailing
+    slash) plus the lowercased title, hashed.
+
+    Catches copies of a story whose URLs differ only in query parameters that
+    normalize_url keeps; the title guards against merging distinct articles
+    that share a path.
+    """
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip("/")
+    key = f"{parts.netloc.lower()}{path}{title.strip().lower()}"
+    return hashlib.md5(key.encode()).hexdigest()
+
+
+def dedupe_articles(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Remove articles whose normalized URL or canonical key was already seen.
+
+    The first occurrence wins, so RSS results (listed before GNews) are kept
+    over the same story picked up by the news API.
+    """
+    seen = set()
+    unique = []
+
+    for article in articles:
+        url = article.get("url")
+        if url:
+            keys = (normalize_url(url), canonical_key(url, article.get("title", "")))
+            if any(key in seen for key in keys):
+                continue
+            seen.update(keys)
+        unique.append(article)
+
+    return unique
@@ -4,13 +4,20 @@ Fetches latest AI news from GNews API for broader coverage.
 """
 
 import os
+import orjson
 import requests
 from datetime import datetime
 from typing import List, Dict, Any
 
+from .dedupe import canonical_key
+from .http_session import make_session
+
 
 GNEWS_API_URL = "https://gnews.io/api/v4/search"
 
+# Shared HTTP session so repeated GNews calls reuse the keep-alive connection
+SESSION = make_session()
+
 # AI-related search queries
 SEARCH_QUERIES = [
     "artificial intelligence",
@@ -40,7 +47,7 @@ def fetch_gnews(api_key: str = None, max_results: int = 10) -> List[Dict[str, An
         return []
 
     articles = []
-    seen_urls = set()
+    seen_keys = set()
 
     # Combined query for efficiency (saves API calls)
     combined_query = "artificial intelligence OR generative AI OR LLM"
@@ -52,19 +59,25 @@ def fetch_gnews(api_key: str = None, max_results: int = 10) -> List[Dict[str, An
             "max": max_results,
             "apikey": api_key,
             "sortby": "publishedAt",
+            # Match the query against title and description only (not full
+            # content), and don't drop articles just because they lack an
+            # image - we never use it
+            "in": "title,description",
+            "nullable": "image",
         }
 
-        response = requests.get(GNEWS_API_URL, params=params, timeout=10)
+        response = SESSION.get(GNEWS_API_URL, params=params, timeout=10)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
 
         for item in data.get("articles", []):
             url = item.get("url", "")
 
-            # Deduplicate by URL
-            if url in seen_urls:
+            # Deduplicate by canonical URL + title (ignores tracking params)
+            key = canonical_key(url, item.get("title", ""))
+            if key in seen_keys:
                 continue
-            seen_urls.add(url)
+            seen_keys.add(key)
 
             article = {
                 "title": item.get("title", "No title"),
@@ -92,17 +105,22 @@ def fetch_gnews_as_text(api_key: str = None, max_results: int = 10) -> str:
     if not articles:
         return "No articles found from GNews API."
 
-    output = f"Found {len(articles)} articles from GNews:\n\n"
+    parts = [f"Found {len(articles)} articles from GNews:\n\n"]
 
     for i, article in enumerate(articles, 1):
-        output += f"--- Article {i} ---\n"
-        output += f"Source: {article['source']}\n"
-        output += f"Title: {article['title']}\n"
-        output += f"Date: {article['date']}\n"
-        output += f"URL: {article['url']}\n"
-        output += f"Summary: {article['summary'][:500]}...\n\n"
-
-    return output
+        summary = article['summary']
+        if len(summary) > 500:
+            summary = summary[:500]
+        parts.append(
+            f"--- Article {i} ---\n"
+            f"Source: {article['source']}\n"
+            f"Title: {article['title']}\n"
+            f"Date: {article['date']}\n"
+            f"URL: {article['url']}\n"
+            f"Summary: {summary}...\n\n"
+        )
+
+    return "".join(parts)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,35 @@
+"""
+HTTP Session Factory
+Builds the pooled, retrying requests sessions shared by the fetchers.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def make_session() -> requests.Session:
+    """
+    Create a requests session with a keep-alive pool and the shared retry policy.
+
+    Keep-alive connections are reused across calls (and across threads when
+    fetching in parallel), so repeat hosts skip the TCP + TLS handshake.
+    """
+    session = requests.Session()
+    # Retry throttling / gateway statuses, but never a read timeout and only
+    # one connect failure: otherwise a single slow host costs several full
+    # timeouts and pushes the scheduled run past its request deadline.
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=3,
+            connect=1,
+            read=0,
+            backoff_factor=0.5,
+            status_forcelist=[429, 502, 503, 504],
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
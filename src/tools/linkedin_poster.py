@@ -3,32 +3,86 @@ LinkedIn Poster Tool
 Posts content to LinkedIn using the Share API (v2).
 """
 
+import hashlib
 import os
+import threading
+import orjson
 import requests
 from typing import Dict, Any, Optional
 
+from .http_session import make_session
+
 
 LINKEDIN_API_URL = "https://api.linkedin.com/v2"
 
+# Shared HTTP session so the profile lookup and the post reuse one connection.
+# urllib3 only retries idempotent methods by default, so a POST is never resent.
+SESSION = make_session()
+# Sent on every LinkedIn call; requests merges session headers into each
+# request, so only the per-token Authorization is built per call
+SESSION.headers.update({"X-Restli-Protocol-Version": "2.0.0"})
+
+# (connect, read) timeouts: fail fast on connect, allow the post time to land
+PROFILE_TIMEOUT = (3, 7)
+POST_TIMEOUT = (3, 20)
+
+# A token's person URN never changes, so /userinfo is looked up once per token
+# (keyed by a hash so raw tokens aren't kept around). Only a handful of tokens
+# are ever live, so the oldest entries are dropped past PERSON_URN_CACHE_MAX_ENTRIES.
+PERSON_URN_CACHE_MAX_ENTRIES = 4
+
+_person_urns: Dict[str, str] = {}
+_person_urns_lock = threading.Lock()
+
+
+def _token_key(access_token: str) -> str:
+    return hashlib.sha256(access_token.encode()).hexdigest()
+
+
+def _remember_person_urn(access_token: str, profile: Dict[str, Any]) -> Optional[str]:
+    """Derive the person URN from a /userinfo profile and cache it for the token."""
+    # The 'sub' field contains the user ID
+    user_id = profile.get("sub")
+    if not user_id:
+        return None
+
+    person_urn = f"urn:li:person:{user_id}"
+    key = _token_key(access_token)
+    with _person_urns_lock:
+        _person_urns.pop(key, None)
+        _person_urns[key] = person_urn
+        # Dicts keep insertion order, so the first key is the oldest entry
+        while len(_person_urns) > PERSON_URN_CACHE_MAX_ENTRIES:
+            del _person_urns[next(iter(_person_urns))]
+    return person_urn
+
+
+def _forget_person_urn(access_token: str):
+    with _person_urns_lock:
+        _person_urns.pop(_token_key(access_token), None)
+
+
+def _cached_person_urn(access_token: str) -> Optional[str]:
+    with _person_urns_lock:
+        return _person_urns.get(_token_key(access_token))
+
 
 def get_user_profile(access_token: str) -> Optional[Dict[str, Any]]:
     """
     Get the authenticated user's LinkedIn profile to retrieve their URN.
     """
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "X-Restli-Protocol-Version": "2.0.0",
-    }
+    headers = {"Authorization": f"Bearer {access_token}"}
 
     try:
-        response = requests.get(
+        response = SESSION.get(
             f"{LINKEDIN_API_URL}/userinfo",
             headers=headers,
-            timeout=10
+            timeout=PROFILE_TIMEOUT,
+            allow_redirects=False,
         )
         response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
+        return orjson.loads(response.content)
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
         print(f"Error fetching LinkedIn profile: {e}")
         return None
 
@@ -45,29 +99,29 @@ def post_to_linkedin(
         access_token: LinkedIn OAuth access token (falls back to env var)
 
     Returns:
-        Dict with success status and post ID or error message
+        Dict with success status and post ID or error message; an HTTP
+        error from LinkedIn also carries its status_code
     """
     access_token = access_token or os.getenv("LINKEDIN_ACCESS_TOKEN")
 
     if not access_token:
         return {"success": False, "error": "LINKEDIN_ACCESS_TOKEN not set"}
 
-    # Get user profile to get the person URN
-    profile = get_user_profile(access_token)
-    if not profile:
-        return {"success": False, "error": "Failed to fetch user profile"}
+    # The URN is cached per token; failed lookups aren't, so the next call retries
+    person_urn = _cached_person_urn(access_token)
+    if not person_urn:
+        # Get user profile to get the person URN
+        profile = get_user_profile(access_token)
+        if not profile:
+            return {"success": False, "error": "Failed to fetch user profile"}
 
-    # The 'sub' field contains the user ID
-    user_id = profile.get("sub")
-    if not user_id:
-        return {"success": False, "error": "Could not get user ID from profile"}
-
-    person_urn = f"urn:li:person:{user_id}"
+        person_urn = _remember_person_urn(access_token, profile)
+        if not person_urn:
+            return {"success": False, "error": "Could not get user ID from profile"}
 
     headers = {
         "Authorization": f"Bearer {access_token}",
         "Content-Type": "application/json",
-        "X-Restli-Protocol-Version": "2.0.0",
     }
 
     # Create the post payload using UGC Posts API
@@ -88,11 +142,12 @@ def post_to_linkedin(
     }
 
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{LINKEDIN_API_URL}/ugcPosts",
             headers=headers,
-            json=payload,
-            timeout=30
+            data=orjson.dumps(payload),
+            timeout=POST_TIMEOUT,
+            allow_redirects=False,
         )
 
         if response.status_code == 201:
@@ -103,8 +158,12 @@ def post_to_linkedin(
                 "message": "Post published successfully"
             }
         else:
+            if response.status_code == 401:
+                # Token revoked or expired; don't keep serving its URN
+                _forget_person_urn(access_token)
             return {
                 "success": False,
+                "status_code": response.status_code,
                 "error": f"HTTP {response.status_code}: {response.text}"
             }
 
@@ -115,6 +174,9 @@ def post_to_linkedin(
 def validate_linkedin_token(access_token: str = None) -> Dict[str, Any]:
     """
     Validate that the LinkedIn access token is still valid.
+
+    Always asks LinkedIn (never the URN cache), and refreshes the cached
+    person URN with the result.
     """
     access_token = access_token or os.getenv("LINKEDIN_ACCESS_TOKEN")
 
@@ -124,12 +186,14 @@ def validate_linkedin_token(access_token: str = None) -> Dict[str, Any]:
     profile = get_user_profile(access_token)
 
     if profile:
+        _remember_person_urn(access_token, profile)
         return {
             "valid": True,
             "user_name": profile.get("name", "Unknown"),
             "user_email": profile.get("email", "Unknown"),
         }
     else:
+        _forget_person_urn(access_token)
         return {"valid": False, "error": "Token is invalid or expired"}
 
 
@@ -3,10 +3,16 @@ RSS Feed Fetcher Tool
 Fetches latest AI news from official company blogs via RSS feeds.
 """
 
+import json
+import os
+import threading
 import feedparser
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import List, Dict, Any
 
+from .http_session import make_session
+
 
 RSS_FEEDS = {
     "OpenAI": "https://openai.com/blog/rss.xml",
@@ -18,6 +24,46 @@ RSS_FEEDS = {
     "Mistral AI": "https://mistral.ai/feed.xml",
 }
 
+# (source name, feed URL) pairs, extracted once instead of on every fetch
+_FEEDS = tuple(RSS_FEEDS.items())
+
+# Feeds are downloaded with requests (not feedparser's own urllib client) so
+# they share a keep-alive pool and retry policy with the other fetchers
+SESSION = make_session()
+
+# (connect, read) timeouts for a feed download
+FEED_TIMEOUT = (3, 10)
+
+# ETag / Last-Modified and last parsed articles per feed, so unchanged feeds
+# are answered with 304 Not Modified instead of being downloaded again
+CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), ".cache"
+)
+FEED_STATE_PATH = os.path.join(CACHE_DIR, "rss_feeds.json")
+# Concurrent fetches (e.g. in the gevent tools server) each save the state;
+# writes are serialized and go through a per-writer temp file
+_feed_state_lock = threading.Lock()
+
+
+def _load_feed_state() -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(FEED_STATE_PATH, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_feed_state(state: Dict[str, Dict[str, Any]]):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{FEED_STATE_PATH}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with _feed_state_lock:
+            with open(tmp_path, 'w') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, FEED_STATE_PATH)
+    except OSError as e:
+        print(f"Could not persist RSS feed state: {e}")
+
 
 def parse_date(entry: Dict) -> datetime:
     """Parse date from RSS entry, handling various formats."""
@@ -28,6 +74,62 @@ def parse_date(entry: Dict) -> datetime:
     return datetime.now()
 
 
+def _fetch_one(
+    source_name: str,
+    feed_url: str,
+    cutoff_time: datetime,
+    state: Dict[str, Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """
+    Fetch one feed and return its articles published after cutoff_time.
+
+    Sends the ETag / Last-Modified stored in state; on 304 the articles parsed
+    last time are reused. state[feed_url] is updated after a full download.
+    """
+    previous = state.get(feed_url, {})
+    headers = {}
+    if previous.get("etag"):
+        headers["If-None-Match"] = previous["etag"]
+    if previous.get("modified"):
+        headers["If-Modified-Since"] = previous["modified"]
+
+    try:
+        response = SESSION.get(feed_url, headers=headers, timeout=FEED_TIMEOUT)
+
+        if response.status_code == 304:
+            all_articles = previous.get("articles", [])
+        else:
+            response.raise_for_status()
+            # Pass the headers on so feedparser still sees the charset and
+            # can resolve relative links against the feed URL
+            response_headers = {key.lower(): value for key, value in response.headers.items()}
+            response_headers.setdefault("content-location", response.url)
+            feed = feedparser.parse(response.content, response_headers=response_headers)
+            all_articles = [
+                {
+                    "title": entry.get("title", "No title"),
+                    "summary": entry.get("summary", entry.get("description", "No summary available")),
+                    "url": entry.get("link", ""),
+                    "date": parse_date(entry).isoformat(),
+                    "source": source_name,
+                }
+                for entry in feed.entries
+            ]
+            state[feed_url] = {
+                "etag": response.headers.get("ETag"),
+                "modified": response.headers.get("Last-Modified"),
+                "articles": all_articles,
+            }
+
+    except Exception as e:
+        print(f"Error fetching {source_name} RSS: {e}")
+        return []
+
+    # Only include recent articles
+    cutoff = cutoff_time.isoformat()
+    return [article for article in all_articles if article["date"] >= cutoff]
+
+
 def fetch_rss_feeds(hours_back: int = 48) -> List[Dict[str, Any]]:
     """
     Fetch articles from all RSS feeds within the specified time window.
@@ -40,28 +142,19 @@ def fetch_rss_feeds(hours_back: int = 48) -> List[Dict[str, Any]]:
     """
     articles = []
     cutoff_time = datetime.now() - timedelta(hours=hours_back)
+    state = _load_feed_state()
 
-    for source_name, feed_url in RSS_FEEDS.items():
-        try:
-            feed = feedparser.parse(feed_url)
-
-            for entry in feed.entries:
-                pub_date = parse_date(entry)
-
-                # Only include recent articles
-                if pub_date >= cutoff_time:
-                    article = {
-                        "title": entry.get("title", "No title"),
-                        "summary": entry.get("summary", entry.get("description", "No summary available")),
-                        "url": entry.get("link", ""),
-                        "date": pub_date.isoformat(),
-                        "source": source_name,
-                    }
-                    articles.append(article)
+    # Feeds are independent network round-trips, so fetch them all at once;
+    # _fetch_one catches its own errors so one bad feed doesn't sink the batch
+    with ThreadPoolExecutor(max_workers=len(_FEEDS)) as executor:
+        futures = [
+            executor.submit(_fetch_one, source_name, feed_url, cutoff_time, state)
+            for source_name, feed_url in _FEEDS
+        ]
+        for future in futures:
+            articles.extend(future.result())
 
-        except Exception as e:
-            print(f"Error fetching {source_name} RSS: {e}")
-            continue
+    _save_feed_state(state)
 
     # Sort by date (newest first)
     articles.sort(key=lambda x: x["date"], reverse=True)
@@ -78,17 +171,22 @@ def fetch_rss_feeds_as_text(hours_back: int = 48) -> str:
     if not articles:
         return "No recent articles found in RSS feeds."
 
-    output = f"Found {len(articles)} articles from RSS feeds:\n\n"
+    parts = [f"Found {len(articles)} articles from RSS feeds:\n\n"]
 
     for i, article in enumerate(articles, 1):
-        output += f"--- Article {i} ---\n"
-        output += f"Source: {article['source']}\n"
-        output += f"Title: {article['title']}\n"
-        output += f"Date: {article['date']}\n"
-        output += f"URL: {article['url']}\n"
-        output += f"Summary: {article['summary'][:500]}...\n\n"
-
-    return output
+        summary = article['summary']
+        if len(summary) > 500:
+            summary = summary[:500]
+        parts.append(
+            f"--- Article {i} ---\n"
+            f"Source: {article['source']}\n"
+            f"Title: {article['title']}\n"
+            f"Date: {article['date']}\n"
+            f"URL: {article['url']}\n"
+            f"Summary: {summary}...\n\n"
+        )
+
+    return "".join(parts)
 
 
 if __name__ == "__main__":